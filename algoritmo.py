@@ -1,5 +1,12 @@
+import hashlib
+import sys
+import time
+import numpy as np
 import pandas as pd
-from typing import List, Tuple, Dict, Set
+from collections import Counter, deque
+from typing import List, Tuple, Dict, Set, Optional
+
+from tribunais import coordenadas_tj, DISTANCIAS_KM, ids_tribunais, pontuar_ciclos
 
 
 DEBUG_MODE = True  # ✅ Ative/desative aqui
@@ -25,7 +32,7 @@ def criar_juizes(df: pd.DataFrame) -> List[Juiz]:
         juiz = Juiz(
             nome=row["Nome"],
             origem=row["Origem"],
-            destinos=[row.get("Destino1", ""), row.get("Destino2", ""), row.get("Destino3", "")],
+            destinos=[row.get(f"Destino {i}", row.get(f"Destino{i}", "")) for i in (1, 2, 3)],
             entrancia=row.get("Entrância", "Não informada")
         )
         juizes.append(juiz)
@@ -74,6 +81,22 @@ def encontrar_quadrangulacoes(juizes: List[Juiz]) -> List[Tuple[Juiz, Juiz, Juiz
     return quadrangulacoes
 
 
+def calcular_estatisticas_tribunais(juizes: List[Juiz]) -> Dict[str, Dict[str, int]]:
+    """
+    Para cada tribunal: quantos juízes o procuram, quantos querem sair dele e a soma dos dois
+    """
+    stats = {}
+    for juiz in juizes:
+        stats.setdefault(juiz.origem, {"procurado": 0, "exportador": 0, "conectividade": 0})
+        stats[juiz.origem]["exportador"] += 1
+        for destino in dict.fromkeys(juiz.destinos):
+            stats.setdefault(destino, {"procurado": 0, "exportador": 0, "conectividade": 0})
+            stats[destino]["procurado"] += 1
+    for valores in stats.values():
+        valores["conectividade"] = valores["procurado"] + valores["exportador"]
+    return stats
+
+
 def formatar_nome_e_info(juiz: Juiz) -> str:
     destino = " / ".join(juiz.destinos)
     return f"{juiz.nome} ({juiz.origem} → {destino}) | Entrância: {juiz.entrancia}"
@@ -96,15 +119,13 @@ def formatar_quadrangulacao(q: Tuple[Juiz, Juiz, Juiz, Juiz]) -> str:
 # 🧪 TESTES INTERNOS
 # ==========================
 
-def analisar_cobertura(juizes: List[Juiz], casais, triangulacoes, quadrangulacoes) -> Dict[str, Set[str]]:
+def analisar_cobertura(juizes: List[Juiz], casais, triangulacoes, quadrangulacoes) -> Dict[str, object]:
     envolvidos = set()
+    componentes = analisar_componentes(juizes)
 
-    for casal in casais:
-        envolvidos.update([casal[0].nome, casal[1].nome])
-    for tri in triangulacoes:
-        envolvidos.update([tri[0].nome, tri[1].nome, tri[2].nome])
-    for quad in quadrangulacoes:
-        envolvidos.update([quad[0].nome, quad[1].nome, quad[2].nome, quad[3].nome])
+    # Cada lista pode trazer ciclos de qualquer tamanho (ex.: ciclos de 5+ junto das quadrangulações)
+    for ciclo in [*casais, *triangulacoes, *quadrangulacoes]:
+        envolvidos.update(j.nome for j in ciclo)
 
     nomes_todos = set(j.nome for j in juizes)
     nomes_nao_alcancados = nomes_todos - envolvidos
@@ -115,9 +136,549 @@ def analisar_cobertura(juizes: List[Juiz], casais, triangulacoes, quadrangulacoe
         print("❌ Juízes não envolvidos em nenhuma formação:", len(nomes_nao_alcancados))
         for nome in sorted(nomes_nao_alcancados):
             print(" -", nome)
+        print("🕸️ Componentes de tribunais:", len(componentes["tribunais"]))
+        print("🕸️ Juízes sem nenhum ciclo possível:", len(componentes["descartados"]))
 
     return {
         "todos": nomes_todos,
         "envolvidos": envolvidos,
-        "nao_envolvidos": nomes_nao_alcancados
+        "nao_envolvidos": nomes_nao_alcancados,
+        "componentes_tribunais": componentes["tribunais"],
+        "componentes_juizes": [set(j.nome for j in c) for c in componentes["subproblemas"]],
+        "impossiveis": set(j.nome for j in componentes["descartados"]),
+    }
+
+
+# ==========================
+# 🔮 SIMULADOR DE DESTINOS
+# ==========================
+
+def _indexar_por_origem(juizes: List[Juiz]) -> Dict[str, List[int]]:
+    por_origem = {}
+    for i, juiz in enumerate(juizes):
+        por_origem.setdefault(juiz.origem, []).append(i)
+    return por_origem
+
+
+def _montar_grafo(juizes: List[Juiz]) -> List[List[int]]:
+    """
+    Lista de adjacência entre juízes: i → j quando o juiz i deseja a origem do juiz j
+    """
+    por_origem = _indexar_por_origem(juizes)
+    adjacencia = []
+    for i, juiz in enumerate(juizes):
+        vizinhos = []
+        for destino in dict.fromkeys(juiz.destinos):
+            if destino == juiz.origem:
+                continue
+            vizinhos.extend(j for j in por_origem.get(destino, []) if j != i)
+        adjacencia.append(vizinhos)
+    return adjacencia
+
+
+def _inverter_grafo(adjacencia: List[List[int]]) -> List[List[int]]:
+    reverso = [[] for _ in adjacencia]
+    for i, vizinhos in enumerate(adjacencia):
+        for j in vizinhos:
+            reverso[j].append(i)
+    return reverso
+
+
+def _distancias_ate(reverso: List[List[int]], alvo: int, limite: int) -> Dict[int, int]:
+    """
+    Índice de alcançabilidade reversa: menor número de passos de cada juiz até o alvo
+    """
+    distancias = {alvo: 0}
+    fila = deque([alvo])
+    while fila:
+        atual = fila.popleft()
+        if distancias[atual] >= limite:
+            continue
+        for anterior in reverso[atual]:
+            if anterior not in distancias:
+                distancias[anterior] = distancias[atual] + 1
+                fila.append(anterior)
+    return distancias
+
+
+def _contar_retornos(juizes: List[Juiz], adjacencia: List[List[int]], alvo: int,
+                     inicio: int, distancias: Dict[int, int], tamanho_max: int) -> Counter:
+    """
+    Conta os ciclos alvo → inicio → ... → alvo (por tamanho), respeitando origens distintas
+    """
+    contagem = Counter()
+    caminho = {alvo, inicio}
+    origens = {juizes[alvo].origem, juizes[inicio].origem}
+
+    def visitar(atual, tamanho):
+        for proximo in adjacencia[atual]:
+            if proximo == alvo:
+                contagem[tamanho] += 1
+                continue
+            if proximo in caminho or juizes[proximo].origem in origens:
+                continue
+            if tamanho + distancias.get(proximo, tamanho_max + 1) > tamanho_max:
+                continue
+            caminho.add(proximo)
+            origens.add(juizes[proximo].origem)
+            visitar(proximo, tamanho + 1)
+            caminho.discard(proximo)
+            origens.discard(juizes[proximo].origem)
+
+    if distancias.get(inicio, tamanho_max + 1) < tamanho_max:
+        visitar(inicio, 2)
+    return contagem
+
+
+def simular_destinos(juizes: List[Juiz], nome: str, tribunais: Optional[List[str]] = None,
+                     tamanho_max: int = 4) -> List[Dict]:
+    """
+    Simula, para um juiz, a inclusão (ou troca) de cada tribunal como destino.
+
+    Calcula apenas a variação dos ciclos que passam pelo juiz, usando o índice de
+    alcançabilidade reversa para podar caminhos que não conseguem voltar a ele.
+    Retorna as alternativas ordenadas pelo ganho de ciclos.
+    """
+    indice = next((i for i, j in enumerate(juizes) if j.nome == nome.strip()), None)
+    if indice is None:
+        raise ValueError(f"Juiz não encontrado: {nome}")
+
+    juiz = juizes[indice]
+    tribunais = list(coordenadas_tj) if tribunais is None else tribunais
+    adjacencia = _montar_grafo(juizes)
+    distancias = _distancias_ate(_inverter_grafo(adjacencia), indice, tamanho_max - 1)
+    por_origem = _indexar_por_origem(juizes)
+
+    def ciclos_via(tribunal):
+        total = Counter()
+        for inicio in por_origem.get(tribunal, []):
+            if inicio != indice:
+                total.update(_contar_retornos(juizes, adjacencia, indice, inicio, distancias, tamanho_max))
+        return total
+
+    atuais = {d: sum(ciclos_via(d).values()) for d in dict.fromkeys(juiz.destinos) if d != juiz.origem}
+
+    alternativas = []
+    for tribunal in tribunais:
+        if tribunal == juiz.origem:
+            continue
+        por_tamanho = ciclos_via(tribunal)
+        ganho = sum(por_tamanho.values())
+        ja_desejado = tribunal in atuais
+        substituicoes = {} if ja_desejado else {d: ganho - n for d, n in atuais.items()}
+        melhor = max(substituicoes.items(), key=lambda x: x[1]) if substituicoes else None
+        alternativas.append({
+            "tribunal": tribunal,
+            "ja_desejado": ja_desejado,
+            "ciclos_por_tamanho": dict(sorted(por_tamanho.items())),
+            "ganho_adicionar": 0 if ja_desejado else ganho,
+            "substituicoes": substituicoes,
+            "melhor_substituicao": melhor,
+        })
+
+    alternativas.sort(key=lambda a: (-a["ganho_adicionar"], a["tribunal"]))
+    return alternativas
+
+
+# ==========================
+# 🧩 QUASE-CICLOS
+# ==========================
+
+def _indice_dois_passos(juizes: List[Juiz], adjacencia: List[List[int]]) -> List[List[Tuple[int, int]]]:
+    """
+    Para cada juiz i, os pares (j, k) com i → j → k e origens distintas
+    """
+    indice = []
+    for i, vizinhos in enumerate(adjacencia):
+        pares = []
+        for j in vizinhos:
+            for k in adjacencia[j]:
+                if len({juizes[i].origem, juizes[j].origem, juizes[k].origem}) == 3:
+                    pares.append((j, k))
+        indice.append(pares)
+    return indice
+
+
+def _caminhos_a_partir(juizes: List[Juiz], adjacencia: List[List[int]], dois_passos: List[List[Tuple[int, int]]],
+                       inicio: int, max_arestas: int) -> List[Tuple[int, ...]]:
+    """
+    Caminhos simples (origens distintas) com até max_arestas arestas, sem incluir o início
+    """
+    caminhos = []
+
+    def estender(caminho, origens, restantes):
+        if restantes == 0:
+            caminhos.append(tuple(caminho[1:]))
+            return
+        ultimo = caminho[-1]
+        if restantes >= 2:
+            for j, k in dois_passos[ultimo]:
+                if juizes[j].origem in origens or juizes[k].origem in origens:
+                    continue
+                estender(caminho + [j, k], origens | {juizes[j].origem, juizes[k].origem}, restantes - 2)
+        else:
+            for j in adjacencia[ultimo]:
+                if juizes[j].origem not in origens:
+                    estender(caminho + [j], origens | {juizes[j].origem}, 0)
+
+    for arestas in range(1, max_arestas + 1):
+        estender([inicio], {juizes[inicio].origem}, arestas)
+    return caminhos
+
+
+def _juizes_em_ciclos(juizes: List[Juiz], adjacencia: List[List[int]], tamanho_max: int) -> Set[int]:
+    reverso = _inverter_grafo(adjacencia)
+    envolvidos = set()
+    for i in range(len(juizes)):
+        distancias = _distancias_ate(reverso, i, tamanho_max - 1)
+        if any(_contar_retornos(juizes, adjacencia, i, j, distancias, tamanho_max) for j in adjacencia[i]):
+            envolvidos.add(i)
+    return envolvidos
+
+
+def encontrar_quase_ciclos(juizes: List[Juiz], nao_envolvidos: Optional[Set[str]] = None,
+                           tamanho_max: int = 4) -> Dict[str, object]:
+    """
+    Para cada juiz sem ciclo, lista os ciclos de até tamanho_max pessoas que fechariam
+    se um único participante acrescentasse um destino.
+
+    Os ciclos são montados a partir de caminhos reais que saem do juiz (adjacência direta)
+    e que chegam a ele (adjacência reversa), ambos compostos pelo índice de dois passos.
+    Também agrega quais arestas (juiz, tribunal) desbloqueariam mais juízes.
+    """
+    adjacencia = _montar_grafo(juizes)
+    reverso = _inverter_grafo(adjacencia)
+    ida = _indice_dois_passos(juizes, adjacencia)
+    volta = _indice_dois_passos(juizes, reverso)
+
+    if nao_envolvidos is None:
+        envolvidos = _juizes_em_ciclos(juizes, adjacencia, tamanho_max)
+        alvos = [i for i in range(len(juizes)) if i not in envolvidos]
+    else:
+        alvos = [i for i, j in enumerate(juizes) if j.nome in nao_envolvidos]
+
+    por_juiz = {}
+    desbloqueios = {}
+    for u in alvos:
+        saidas = [()] + _caminhos_a_partir(juizes, adjacencia, ida, u, tamanho_max - 1)
+        entradas = [()] + [c[::-1] for c in _caminhos_a_partir(juizes, reverso, volta, u, tamanho_max - 1)]
+        quase = []
+        for saida in saidas:
+            origens_saida = {juizes[i].origem for i in saida}
+            for entrada in entradas:
+                tamanho = 1 + len(saida) + len(entrada)
+                if tamanho < 2 or tamanho > tamanho_max:
+                    continue
+                if any(juizes[i].origem in origens_saida for i in entrada):
+                    continue
+                de = saida[-1] if saida else u
+                para = entrada[0] if entrada else u
+                tribunal = juizes[para].origem
+                if juizes[de].quer_ir_para(tribunal):
+                    continue
+                ciclo = (u,) + saida + entrada
+                quase.append({
+                    "ciclo": [juizes[i].nome for i in ciclo],
+                    "tamanho": tamanho,
+                    "juiz_aresta": juizes[de].nome,
+                    "tribunal_faltante": tribunal,
+                })
+                desbloqueios.setdefault((juizes[de].nome, tribunal), set()).add(juizes[u].nome)
+        if quase:
+            quase.sort(key=lambda q: (q["tamanho"], q["ciclo"]))
+            por_juiz[juizes[u].nome] = quase
+
+    arestas = [
+        {"juiz": juiz, "tribunal": tribunal, "juizes_desbloqueados": len(nomes)}
+        for (juiz, tribunal), nomes in desbloqueios.items()
+    ]
+    arestas.sort(key=lambda a: (-a["juizes_desbloqueados"], a["juiz"], a["tribunal"]))
+
+    if DEBUG_MODE:
+        print("🧩 Juízes sem ciclo analisados:", len(alvos))
+        print("🧩 Juízes com quase-ciclos:", len(por_juiz))
+
+    return {
+        "por_juiz": por_juiz,
+        "arestas": arestas,
+    }
+
+
+# ==========================
+# 🔁 CICLOS DE QUALQUER TAMANHO
+# ==========================
+
+def _gerar_ciclos(juizes: List[Juiz], tamanho_max: int, raizes: Optional[int] = None,
+                  distancia_max_km: Optional[float] = None, criterio_distancia: str = "total",
+                  tamanho_min: int = 2):
+    """
+    Busca em profundidade iterativa; gera (progresso, ciclo) a cada ciclo encontrado
+    e (progresso, None) periodicamente, para que o chamador possa interromper a busca.
+    O progresso é a fração aproximada da árvore de busca já percorrida.
+
+    Com distancia_max_km, caminhos parciais que já passam do limite (soma ou maior
+    trecho, conforme criterio_distancia) são podados. Ciclos com menos de tamanho_min
+    juízes são percorridos, mas não gerados.
+    """
+    adjacencia = _montar_grafo(juizes)
+    reverso = _inverter_grafo(adjacencia)
+    raizes = len(juizes) if raizes is None else min(raizes, len(juizes))
+    passos = 0
+
+    # Raízes iniciais têm mais ciclos (só visitam juízes de posição maior)
+    pesos = [(len(juizes) - i) ** (tamanho_max - 1) for i in range(raizes)]
+    acumulados = [sum(pesos[:i]) for i in range(raizes)]
+    total_pesos = sum(pesos) or 1
+
+    def progresso(inicio, pilha):
+        fracao, peso = 0.0, 1.0
+        for no, posicao, _ in pilha:
+            total = len(adjacencia[no]) or 1
+            fracao += peso * max(posicao - 1, 0) / total
+            peso /= total
+        return (acumulados[inicio] + pesos[inicio] * fracao) / total_pesos
+
+    limite = float("inf") if distancia_max_km is None else distancia_max_km
+    ids = ids_tribunais([j.origem for j in juizes]).tolist()
+    km = DISTANCIAS_KM.tolist()
+    somar = criterio_distancia == "total"
+    tamanho_min = max(tamanho_min, 2)
+
+    for inicio in range(raizes):
+        distancias = _distancias_ate(reverso, inicio, tamanho_max - 1)
+        caminho = [inicio]
+        origens = {juizes[inicio].origem}
+        pilha = [[inicio, 0, 0.0]]
+        while pilha:
+            no, posicao, percorrido = pilha[-1]
+            if posicao == len(adjacencia[no]):
+                pilha.pop()
+                origens.discard(juizes[caminho.pop()].origem)
+                continue
+            pilha[-1][1] += 1
+            proximo = adjacencia[no][posicao]
+            passos += 1
+            if passos % 1000 == 0:
+                yield progresso(inicio, pilha), None
+            if distancia_max_km is not None:
+                trecho = km[ids[no]][ids[proximo]]
+                total = percorrido + trecho if somar else max(percorrido, trecho)
+                if total > limite:
+                    continue
+            else:
+                total = 0.0
+            if proximo == inicio:
+                if len(caminho) >= tamanho_min:
+                    yield progresso(inicio, pilha), tuple(juizes[i] for i in caminho)
+            elif (proximo > inicio and juizes[proximo].origem not in origens
+                  and len(caminho) + distancias.get(proximo, tamanho_max) <= tamanho_max):
+                caminho.append(proximo)
+                origens.add(juizes[proximo].origem)
+                pilha.append([proximo, 0, total])
+
+
+def encontrar_ciclos(juizes: List[Juiz], tamanho_max: int = 4, distancia_max_km: Optional[float] = None,
+                     criterio_distancia: str = "total") -> List[Tuple[Juiz, ...]]:
+    """
+    Enumera cada ciclo de 2 a tamanho_max juízes uma única vez,
+    começando pelo juiz de menor posição dentro do seu componente
+    """
+    ciclos = []
+    for subproblema in analisar_componentes(juizes)["subproblemas"]:
+        ciclos.extend(
+            c for _, c in _gerar_ciclos(subproblema, tamanho_max, None, distancia_max_km, criterio_distancia)
+            if c is not None
+        )
+    return ciclos
+
+
+def ordenar_por_distancia(ciclos: List[Tuple[Juiz, ...]], criterio: str = "total") -> List[Tuple[Juiz, ...]]:
+    """
+    Ordena os ciclos do mais curto ao mais longo (soma dos trechos ou maior trecho)
+    """
+    pontuacao = pontuar_ciclos([[j.origem for j in c] for c in ciclos], criterio)
+    return [ciclos[i] for i in np.argsort(pontuacao, kind="stable")]
+
+
+def encontrar_ciclos_com_orcamento(juizes: List[Juiz], tamanho_max: int = 6, nome: Optional[str] = None,
+                                   max_ciclos: Optional[int] = None, max_segundos: Optional[float] = None,
+                                   max_memoria_mb: Optional[float] = None, distancia_max_km: Optional[float] = None,
+                                   criterio_distancia: str = "total", tamanho_min: int = 2) -> Dict[str, object]:
+    """
+    Versão da busca com limites de ciclos, tempo e memória aproximada, para ciclos longos.
+    Só os ciclos de tamanho_min a tamanho_max juízes são devolvidos e contam nos limites
+    e na estimativa.
+
+    Se nome for informado, busca apenas os ciclos que passam por esse juiz.
+    Devolve os ciclos encontrados, se a busca foi completa, o motivo da interrupção
+    e uma estimativa de quantos ciclos ficaram de fora (None se a busca parou antes
+    de encontrar algum ciclo ou de medir algum progresso).
+    """
+    relogio = time.perf_counter()
+    subproblemas = analisar_componentes(juizes)["subproblemas"]
+    raizes = None
+    if nome is not None:
+        nome = nome.strip()
+        subproblemas = [
+            sorted(s, key=lambda j: j.nome != nome) for s in subproblemas if any(j.nome == nome for j in s)
+        ][:1]
+        raizes = 1
+
+    pesos = [1 if raizes else len(s) for s in subproblemas]
+    total_pesos = sum(pesos) or 1
+    ciclos = []
+    memoria = 0
+    motivo = None
+    progresso_global = 0.0
+
+    for subproblema, peso in zip(subproblemas, pesos):
+        for progresso, ciclo in _gerar_ciclos(subproblema, tamanho_max, raizes, distancia_max_km,
+                                                criterio_distancia, tamanho_min):
+            atual = progresso_global + progresso * peso / total_pesos
+            if max_segundos is not None and time.perf_counter() - relogio >= max_segundos:
+                motivo = "tempo"
+            elif ciclo is not None and max_ciclos is not None and len(ciclos) >= max_ciclos:
+                motivo = "ciclos"
+            elif ciclo is not None and max_memoria_mb is not None \
+                    and memoria + sys.getsizeof(ciclo) + 8 > max_memoria_mb * 2 ** 20:
+                motivo = "memoria"
+            if motivo:
+                break
+            if ciclo is not None:
+                ciclos.append(ciclo)
+                memoria += sys.getsizeof(ciclo) + 8
+        if motivo:
+            break
+        progresso_global += peso / total_pesos
+
+    estimativa = 0
+    if motivo:
+        estimativa = int(len(ciclos) / atual) - len(ciclos) if atual > 0 and ciclos else None
+
+    if DEBUG_MODE and motivo:
+        print(f"⏱️ Busca interrompida ({motivo}) com {len(ciclos)} ciclos; faltariam ~{estimativa}")
+
+    return {
+        "ciclos": ciclos,
+        "completo": motivo is None,
+        "motivo": motivo,
+        "ciclos_estimados_restantes": estimativa,
+        "tempo_segundos": time.perf_counter() - relogio,
+    }
+
+
+def calcular_hash_snapshot(juizes: List[Juiz]) -> str:
+    """
+    Impressão digital da base: muda sempre que algum juiz, origem ou destino muda
+    """
+    conteudo = sorted(
+        "\x1f".join([j.nome, j.origem, *j.destinos, j.entrancia]) for j in juizes
+    )
+    return hashlib.sha256("\x1e".join(conteudo).encode("utf-8")).hexdigest()
+
+
+def chave_ciclo(membros: List[Tuple[str, str]]) -> str:
+    """
+    Chave canônica de um ciclo, dada a lista de (nome, origem) na ordem do ciclo.
+    Não depende da posição dos juízes na planilha nem de qual membro inicia o ciclo.
+    """
+    inicio = membros.index(min(membros))
+    rotacionado = membros[inicio:] + membros[:inicio]
+    texto = "\x1e".join(f"{nome}\x1f{origem}" for nome, origem in rotacionado)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()[:32]
+
+
+# ==========================
+# 🕸️ COMPONENTES FORTEMENTE CONEXOS
+# ==========================
+
+def _componentes_fortes(adjacencia: List[List[int]]) -> List[List[int]]:
+    """
+    Algoritmo de Tarjan (iterativo, para não estourar a pilha de recursão)
+    """
+    indice = [None] * len(adjacencia)
+    menor = [0] * len(adjacencia)
+    na_pilha = [False] * len(adjacencia)
+    pilha = []
+    componentes = []
+    contador = 0
+
+    for raiz in range(len(adjacencia)):
+        if indice[raiz] is not None:
+            continue
+        chamadas = [(raiz, 0)]
+        while chamadas:
+            v, i = chamadas.pop()
+            if i == 0:
+                indice[v] = menor[v] = contador
+                contador += 1
+                pilha.append(v)
+                na_pilha[v] = True
+            for j in range(i, len(adjacencia[v])):
+                w = adjacencia[v][j]
+                if indice[w] is None:
+                    chamadas.append((v, j + 1))
+                    chamadas.append((w, 0))
+                    break
+                if na_pilha[w]:
+                    menor[v] = min(menor[v], indice[w])
+            else:
+                if menor[v] == indice[v]:
+                    componente = []
+                    while True:
+                        w = pilha.pop()
+                        na_pilha[w] = False
+                        componente.append(w)
+                        if w == v:
+                            break
+                    componentes.append(sorted(componente))
+                if chamadas:
+                    pai = chamadas[-1][0]
+                    menor[pai] = min(menor[pai], menor[v])
+    return componentes
+
+
+def analisar_componentes(juizes: List[Juiz]) -> Dict[str, list]:
+    """
+    Pré-análise estrutural antes da busca de ciclos.
+
+    Um juiz só participa de ciclo se sua origem e algum destino estiverem no mesmo
+    componente fortemente conexo do grafo de tribunais, e se ele próprio estiver
+    num componente (com 2+ juízes) do grafo de juízes. Os demais são descartados,
+    e cada componente de juízes vira um subproblema independente.
+    """
+    siglas = sorted({j.origem for j in juizes} | {d for j in juizes for d in j.destinos})
+    posicao = {s: i for i, s in enumerate(siglas)}
+    arestas_tj = [set() for _ in siglas]
+    for juiz in juizes:
+        for destino in juiz.destinos:
+            if destino != juiz.origem:
+                arestas_tj[posicao[juiz.origem]].add(posicao[destino])
+
+    componente_tj = {}
+    componentes_tj = []
+    for componente in _componentes_fortes([sorted(a) for a in arestas_tj]):
+        if len(componente) > 1:
+            componentes_tj.append([siglas[i] for i in componente])
+        for i in componente:
+            componente_tj[siglas[i]] = len(componentes_tj) if len(componente) > 1 else None
+
+    viaveis = [
+        j for j in juizes
+        if componente_tj[j.origem] is not None
+        and any(componente_tj[d] == componente_tj[j.origem] for d in j.destinos)
+    ]
+
+    subproblemas = []
+    em_componente = set()
+    for componente in _componentes_fortes(_montar_grafo(viaveis)):
+        if len(componente) > 1:
+            subproblemas.append([viaveis[i] for i in componente])
+            em_componente.update(id(viaveis[i]) for i in componente)
+
+    subproblemas.sort(key=len, reverse=True)
+    return {
+        "tribunais": sorted(componentes_tj, key=len, reverse=True),
+        "subproblemas": subproblemas,
+        "descartados": [j for j in juizes if id(j) not in em_componente],
     }
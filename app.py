@@ -1,19 +1,18 @@
 import streamlit as st
-import gspread
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-import unicodedata
 
 from algoritmo import (
-    buscar_permutas,
-    buscar_triangulacoes,
-    buscar_quadrangulacoes,
-    gerar_relatorio_cobertura,
+    criar_juizes, calcular_estatisticas_tribunais, encontrar_ciclos_com_orcamento, formatar_nome_e_info,
+    analisar_componentes,
 )
+from armazenamento import RepositorioCiclos
+from tribunais import pontuar_ciclos
+from cache_figuras import cache_figuras, precomputar_figuras_globais
+from carregamento import carregar_fontes
 
-
-from mapa import mostrar_mapa_triangulacoes, mostrar_mapa_casais
+# gspread, Plotly, mapa.py e graficos.py são importados só quando há busca na
+# planilha ou um gráfico precisa ser montado (fora do cache), para acelerar a
+# partida a frio. Acompanhe com: python benchmarks/tempo_importacao.py
 
 # ===============================
 # Configuração da página
@@ -75,37 +74,67 @@ st.markdown(
     unsafe_allow_html=True
 )
 
+FONTE_PADRAO = "planilha:Permuta - Magistratura Estadual"
+
 # ===============================
 # Funções auxiliares
 # ===============================
-def normalizar_texto(texto):
-    if not isinstance(texto, str):
-        return ""
-    texto_norm = unicodedata.normalize('NFKD', texto)
-    texto_sem_acento = ''.join(c for c in texto_norm if not unicodedata.combining(c))
-    return texto_sem_acento.strip().lower()
-
 @st.cache_data(ttl=300)
 def carregar_dados():
     try:
-        creds_dict = st.secrets["google_service_account"]
-        gc = gspread.service_account_from_dict(creds_dict)
-        sheet = gc.open("Permuta - Magistratura Estadual").sheet1
-        data = sheet.get_all_values()
-        df = pd.DataFrame(data[1:], columns=data[0])
-        if "Entrância" not in df.columns:
-            df["Entrância"] = "Não informada"
-        for coluna in ["Destino 1", "Destino 2", "Destino 3", "E-mail", "Entrância"]:
-            if coluna in df.columns:
-                df[coluna] = df[coluna].apply(lambda x: str(x).strip() if pd.notnull(x) and str(x).strip() != "" else None)
-        df["Nome"] = df["Nome"].str.strip()
-        df["Origem"] = df["Origem"].str.strip()
-        df["Nome_Normalizado"] = df["Nome"].apply(normalizar_texto)
-        return df
+        # Várias abas/arquivos podem ser listados em fontes_dados nos secrets
+        fontes = list(st.secrets.get("fontes_dados", [FONTE_PADRAO]))
+        return carregar_fontes(fontes, st.secrets.get("google_service_account"))
     except Exception as e:
         st.error(f"Erro ao carregar dados: {str(e)}")
         return pd.DataFrame()
 
+@st.cache_resource
+def abrir_repositorio():
+    return RepositorioCiclos()
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def buscar_ciclos_longos(snapshot, nome, distancia_max, _juizes):
+    """
+    Busca com orçamento dos ciclos de 5 e 6 juízes, uma vez por base, juiz e distância
+    (a lista de juízes não entra na chave: o snapshot já a identifica)
+    """
+    return encontrar_ciclos_com_orcamento(
+        _juizes, tamanho_max=6, tamanho_min=5, nome=nome,
+        max_ciclos=500, max_segundos=5, max_memoria_mb=50,
+        distancia_max_km=None if distancia_max >= 4500 else distancia_max, criterio_distancia="maximo",
+    )
+
+
+def formatar_ciclo(ciclo):
+    if len(ciclo) == 2:
+        return f"{ciclo[0]['nome']} ⇄ {ciclo[1]['nome']}"
+    return " → ".join(f"{m['nome']} ({m['origem']})" for m in ciclo)
+
+
+def construir_mapa(tamanho, registros):
+    import mapa
+
+    if tamanho == 2:
+        return mapa.mostrar_mapa_casais(registros)
+    if tamanho == 3:
+        return mapa.mostrar_mapa_triangulacoes(registros)
+    return mapa.mostrar_mapa_ciclos_n(registros, tamanho)
+
+
+def ciclo_para_registro(ciclo):
+    """
+    Converte um ciclo do repositório no formato de linha esperado por mapa.py
+    """
+    registro = {}
+    for i, membro in enumerate(ciclo):
+        letra = chr(65 + i)
+        registro[f"Juiz {letra}"] = membro["nome"]
+        registro[f"Origem {letra}"] = membro["origem"]
+        registro[f"Destino {letra}"] = ciclo[(i + 1) % len(ciclo)]["origem"]
+    return registro
+
 # ===============================
 # Cabeçalho
 # ===============================
@@ -174,14 +203,44 @@ entrancia_juiz = juiz.get("Entrância", "Não informada")
 st.markdown(f"**Origem:** 📍 `{origem}` &nbsp;&nbsp;&nbsp; | &nbsp;&nbsp;&nbsp; **Entrância:** `{entrancia_juiz}`")
 st.markdown(f"**Destinos pretendidos:** 🎯 {', '.join([d for d in destinos if d])}")
 
+distancia_max = st.slider(
+    "📏 Distância máxima por deslocamento (km)", min_value=0, max_value=4500, value=4500, step=100,
+    help="Descarta permutas em que algum juiz se deslocaria mais do que isso.",
+)
+
 # ===============================
 # Execução dos Algoritmos
 # ===============================
 with st.spinner("🔄 Buscando permutas possíveis..."):
 
-    resultados_casais = buscar_permutas_diretas(df, nome_selecionado)
-    resultados_triangulacoes = buscar_triangulacoes(df, nome_selecionado)
-    resultados_quadrangulacoes = buscar_quadrangulacoes(df, nome_selecionado)
+    juizes = criar_juizes(df)
+    repositorio = abrir_repositorio()
+    snapshot = repositorio.obter_ou_calcular(juizes)
+    ciclos_juiz = repositorio.ciclos_do_juiz(snapshot, nome_selecionado)
+
+    # Ordena do ciclo mais curto ao mais longo e aplica o limite de deslocamento
+    origens_ciclos = [[m["origem"] for m in c] for c in ciclos_juiz]
+    distancia_total = pontuar_ciclos(origens_ciclos, "total")
+    maior_trecho = pontuar_ciclos(origens_ciclos, "maximo")
+    ciclos_juiz = [
+        ciclos_juiz[i] for i in distancia_total.argsort(kind="stable")
+        if distancia_max >= 4500 or maior_trecho[i] <= distancia_max
+    ]
+
+    resultados_casais = [formatar_ciclo(c) for c in ciclos_juiz if len(c) == 2]
+    resultados_triangulacoes = [formatar_ciclo(c) for c in ciclos_juiz if len(c) == 3]
+    resultados_quadrangulacoes = [formatar_ciclo(c) for c in ciclos_juiz if len(c) == 4]
+
+# ===============================
+# Novidades desde a última atualização da base
+# ===============================
+novidades = repositorio.novidades_do_juiz(nome_selecionado, snapshot)
+if novidades["novos"] or novidades["desfeitos"]:
+    st.markdown("## 🆕 O que mudou para você")
+    for ciclo in novidades["novos"]:
+        st.success(f"Nova permuta: {formatar_ciclo(ciclo)}")
+    for ciclo in novidades["desfeitos"]:
+        st.warning(f"Permuta desfeita: {formatar_ciclo(ciclo)}")
 
 # ===============================
 # Visualização de Resultados
@@ -212,11 +271,43 @@ if resultados_quadrangulacoes:
 else:
     st.info("Nenhuma quadrangulação encontrada.")
 
+# ---- Ciclos longos (5 e 6 juízes), com orçamento de tempo e memória
+with st.expander("⬟ Ciclos com 5 ou 6 juízes"):
+    busca_longa = buscar_ciclos_longos(snapshot, nome_selecionado, distancia_max, juizes)
+    ciclos_longos = busca_longa["ciclos"]
+    if not busca_longa["completo"]:
+        restantes = busca_longa["ciclos_estimados_restantes"]
+        estimativa = (
+            f"estimam-se mais ~{restantes} ciclos" if restantes is not None
+            else "não foi possível estimar quantos ciclos faltam"
+        )
+        st.warning(
+            f"⏱️ Busca interrompida ({busca_longa['motivo']}). "
+            f"Exibindo resultados parciais; {estimativa}."
+        )
+    if ciclos_longos:
+        for idx, ciclo in enumerate(ciclos_longos, 1):
+            st.markdown(f"**{idx}.** {' → '.join(formatar_nome_e_info(j) for j in ciclo)}")
+    else:
+        st.info("Nenhum ciclo com 5 ou 6 juízes encontrado.")
+
 # ===============================
-# Visualização Estilizada (Tabelas)
+# Mapas das permutas do juiz (cache por base + juiz)
 # ===============================
+for tamanho in (2, 3, 4):
+    registros = [ciclo_para_registro(c) for c in ciclos_juiz if len(c) == tamanho]
+    if registros:
+        st.plotly_chart(
+            cache_figuras.obter(
+                snapshot, f"mapa_ciclos_{tamanho}", {"juiz": nome_selecionado, "distancia_max": distancia_max},
+                lambda: construir_mapa(tamanho, registros),
+            ),
+            use_container_width=True,
+        )
 
-import pandas as pd
+# ===============================
+# Visualização Estilizada (Tabelas)
+# ===============================
 
 def estilizar_resultados(titulo, dados, tipo):
     if not dados:
@@ -318,11 +409,29 @@ total_juizes = len(df)
 col1.metric(label="👩‍⚖️ Total de Juízes", value=f"{total_juizes}")
 
 # Indicador: Total de Permutas Geradas (Casais + Triangulações + Quadrangulações)
-total_permuta = len(casais) + len(triangulos) + len(quadrangulos)
+total_permuta = sum(repositorio.contar_ciclos(snapshot).values())
 col2.metric(label="🔁 Total de Permutas", value=f"{total_permuta}")
 
 # Indicador: Total de Tribunais distintos
-tribunais_env = set(df['Origem']).union(df['Destino1']).union(df['Destino2']).union(df['Destino3'])
+colunas_tribunais = [c for c in ["Origem", "Destino 1", "Destino 2", "Destino 3"] if c in df.columns]
+tribunais_env = set(df[colunas_tribunais].stack().dropna()) - {""}
 col3.metric(label="🏛️ Tribunais Envolvidos", value=f"{len(tribunais_env)}")
 
+# Gráficos globais: montados uma vez por base e compartilhados entre sessões
+figuras_globais = precomputar_figuras_globais(
+    snapshot,
+    calcular_estatisticas_tribunais(juizes),
+    total_juizes,
+    lambda n: [ciclo_para_registro(c) for c in repositorio.ciclos_da_base(snapshot, n) if len(c) == n],
+    calcular_componentes=lambda: analisar_componentes(juizes),
+)
+col1, col2 = st.columns(2)
+col1.plotly_chart(figuras_globais["tribunais_procurados"], use_container_width=True)
+col2.plotly_chart(figuras_globais["tribunais_exportadores"], use_container_width=True)
+col1.plotly_chart(figuras_globais["tribunais_conectados"], use_container_width=True)
+col2.plotly_chart(figuras_globais["estatisticas_gerais"], use_container_width=True)
+st.plotly_chart(figuras_globais["mapa_casais"], use_container_width=True)
+st.plotly_chart(figuras_globais["mapa_triangulacoes"], use_container_width=True)
+st.plotly_chart(figuras_globais["componentes"], use_container_width=True)
+
 st.markdown("---")
@@ -0,0 +1,340 @@
+import sqlite3
+from contextlib import closing
+from typing import List, Tuple, Dict, Optional, Set
+
+from algoritmo import Juiz, encontrar_ciclos, calcular_hash_snapshot, chave_ciclo
+
+
+CAMINHO_BANCO = "ciclos.sqlite3"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    hash TEXT PRIMARY KEY,
+    tamanho_max INTEGER NOT NULL,
+    criado_em TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS tribunais (
+    tribunal_id INTEGER PRIMARY KEY,
+    sigla TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS juizes (
+    snapshot TEXT NOT NULL,
+    juiz_id INTEGER NOT NULL,
+    nome TEXT NOT NULL,
+    tribunal_id INTEGER NOT NULL,
+    PRIMARY KEY (snapshot, juiz_id)
+);
+CREATE TABLE IF NOT EXISTS ciclos (
+    snapshot TEXT NOT NULL,
+    ciclo_id INTEGER NOT NULL,
+    tamanho INTEGER NOT NULL,
+    PRIMARY KEY (snapshot, ciclo_id)
+);
+CREATE TABLE IF NOT EXISTS ciclo_membros (
+    snapshot TEXT NOT NULL,
+    ciclo_id INTEGER NOT NULL,
+    posicao INTEGER NOT NULL,
+    juiz_id INTEGER NOT NULL,
+    tribunal_id INTEGER NOT NULL,
+    PRIMARY KEY (snapshot, ciclo_id, posicao)
+);
+CREATE TABLE IF NOT EXISTS chaves_ciclos (
+    snapshot TEXT NOT NULL,
+    chave TEXT NOT NULL,
+    ciclo_id INTEGER NOT NULL,
+    PRIMARY KEY (snapshot, chave)
+);
+CREATE TABLE IF NOT EXISTS historico (
+    sequencia INTEGER PRIMARY KEY AUTOINCREMENT,
+    snapshot TEXT NOT NULL,
+    registrado_em TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS novidades (
+    snapshot TEXT NOT NULL,
+    anterior TEXT NOT NULL,
+    nome TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    chave TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_novidades_nome ON novidades (snapshot, nome);
+CREATE INDEX IF NOT EXISTS idx_juizes_nome ON juizes (snapshot, nome);
+CREATE INDEX IF NOT EXISTS idx_membros_juiz ON ciclo_membros (snapshot, juiz_id);
+CREATE INDEX IF NOT EXISTS idx_membros_tribunal ON ciclo_membros (snapshot, tribunal_id);
+"""
+
+
+class RepositorioCiclos:
+    """
+    Armazena os ciclos calculados em SQLite, carimbados com o hash da base,
+    para que sobrevivam a reinícios do Streamlit
+    """
+
+    def __init__(self, caminho: str = CAMINHO_BANCO):
+        self.caminho = caminho
+        with closing(self._conectar()) as con, con:
+            con.executescript(ESQUEMA)
+
+    def _conectar(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.caminho)
+
+    def possui_snapshot(self, snapshot: str, tamanho_max: int = 4) -> bool:
+        with closing(self._conectar()) as con:
+            linha = con.execute(
+                "SELECT tamanho_max FROM snapshots WHERE hash = ?", (snapshot,)
+            ).fetchone()
+        return linha is not None and linha[0] >= tamanho_max
+
+    def salvar(self, snapshot: str, juizes: List[Juiz], ciclos: List[Tuple[Juiz, ...]], tamanho_max: int = 4):
+        with closing(self._conectar()) as con, con:
+            for tabela in ["ciclo_membros", "ciclos", "juizes", "chaves_ciclos"]:
+                con.execute(f"DELETE FROM {tabela} WHERE snapshot = ?", (snapshot,))
+            con.execute("DELETE FROM snapshots WHERE hash = ?", (snapshot,))
+
+            siglas = sorted({j.origem for j in juizes})
+            con.executemany("INSERT OR IGNORE INTO tribunais (sigla) VALUES (?)", [(s,) for s in siglas])
+            tribunal_id = dict(con.execute("SELECT sigla, tribunal_id FROM tribunais"))
+
+            juiz_id = {id(j): i for i, j in enumerate(juizes)}
+            con.executemany(
+                "INSERT INTO juizes VALUES (?, ?, ?, ?)",
+                [(snapshot, i, j.nome, tribunal_id[j.origem]) for i, j in enumerate(juizes)],
+            )
+            con.executemany(
+                "INSERT INTO ciclos VALUES (?, ?, ?)",
+                [(snapshot, c, len(ciclo)) for c, ciclo in enumerate(ciclos)],
+            )
+            con.executemany(
+                "INSERT INTO ciclo_membros VALUES (?, ?, ?, ?, ?)",
+                [
+                    (snapshot, c, posicao, juiz_id[id(j)], tribunal_id[j.origem])
+                    for c, ciclo in enumerate(ciclos)
+                    for posicao, j in enumerate(ciclo)
+                ],
+            )
+            con.executemany(
+                "INSERT OR IGNORE INTO chaves_ciclos VALUES (?, ?, ?)",
+                [
+                    (snapshot, chave_ciclo([(j.nome, j.origem) for j in ciclo]), c)
+                    for c, ciclo in enumerate(ciclos)
+                ],
+            )
+            con.execute("INSERT INTO snapshots (hash, tamanho_max) VALUES (?, ?)", (snapshot, tamanho_max))
+
+    def obter_ou_calcular(self, juizes: List[Juiz], tamanho_max: int = 4) -> str:
+        """
+        Devolve o hash da base, recalculando os ciclos apenas se ela mudou
+        """
+        snapshot = calcular_hash_snapshot(juizes)
+        if not self.possui_snapshot(snapshot, tamanho_max):
+            self.salvar(snapshot, juizes, encontrar_ciclos(juizes, tamanho_max), tamanho_max)
+        self.registrar_historico(snapshot, tamanho_max)
+        return snapshot
+
+    def _ler_ciclos(self, snapshot: str, subconsulta: str, parametros: Tuple,
+                    tamanho_max: Optional[int]) -> List[List[Dict[str, str]]]:
+        with closing(self._conectar()) as con:
+            linhas = con.execute(
+                f"""
+                SELECT m.ciclo_id, j.nome, t.sigla
+                FROM ciclo_membros m
+                JOIN ciclos c ON c.snapshot = m.snapshot AND c.ciclo_id = m.ciclo_id
+                JOIN juizes j ON j.snapshot = m.snapshot AND j.juiz_id = m.juiz_id
+                JOIN tribunais t ON t.tribunal_id = m.tribunal_id
+                WHERE m.snapshot = ? AND c.tamanho <= ? AND m.ciclo_id IN ({subconsulta})
+                ORDER BY c.tamanho, m.ciclo_id, m.posicao
+                """,
+                (snapshot, tamanho_max if tamanho_max is not None else 1 << 30, *parametros),
+            ).fetchall()
+        ciclos = {}
+        for ciclo_id, nome, sigla in linhas:
+            ciclos.setdefault(ciclo_id, []).append({"nome": nome, "origem": sigla})
+        return list(ciclos.values())
+
+    def ciclos_do_juiz(self, snapshot: str, nome: str, tamanho_max: Optional[int] = None) -> List[List[Dict[str, str]]]:
+        return self._ler_ciclos(
+            snapshot,
+            """
+            SELECT mj.ciclo_id
+            FROM juizes j
+            JOIN ciclo_membros mj ON mj.snapshot = j.snapshot AND mj.juiz_id = j.juiz_id
+            WHERE j.snapshot = ? AND j.nome = ?
+            """,
+            (snapshot, nome.strip()),
+            tamanho_max,
+        )
+
+    def ciclos_do_tribunal(self, snapshot: str, sigla: str, tamanho_max: Optional[int] = None) -> List[List[Dict[str, str]]]:
+        return self._ler_ciclos(
+            snapshot,
+            """
+            SELECT mt.ciclo_id
+            FROM tribunais t
+            JOIN ciclo_membros mt ON mt.tribunal_id = t.tribunal_id
+            WHERE mt.snapshot = ? AND t.sigla = ?
+            """,
+            (snapshot, sigla.strip()),
+            tamanho_max,
+        )
+
+    def ciclos_da_base(self, snapshot: str, tamanho_max: Optional[int] = None) -> List[List[Dict[str, str]]]:
+        return self._ler_ciclos(
+            snapshot,
+            "SELECT cb.ciclo_id FROM ciclos cb WHERE cb.snapshot = ?",
+            (snapshot,),
+            tamanho_max,
+        )
+
+    def contar_ciclos(self, snapshot: str) -> Dict[int, int]:
+        with closing(self._conectar()) as con:
+            return dict(con.execute(
+                "SELECT tamanho, COUNT(*) FROM ciclos WHERE snapshot = ? GROUP BY tamanho ORDER BY tamanho",
+                (snapshot,),
+            ))
+
+    def snapshot_anterior(self, snapshot: str) -> Optional[str]:
+        with closing(self._conectar()) as con:
+            linha = con.execute(
+                """
+                SELECT snapshot FROM historico
+                WHERE snapshot != ? AND sequencia < (
+                    SELECT MAX(sequencia) FROM historico WHERE snapshot = ?
+                )
+                ORDER BY sequencia DESC LIMIT 1
+                """,
+                (snapshot, snapshot),
+            ).fetchone()
+        return linha[0] if linha else None
+
+    def registrar_historico(self, snapshot: str, tamanho_max: int = 4):
+        """
+        Acrescenta a base ao histórico quando ela muda e grava o feed de novidades
+        em relação à base imediatamente anterior.
+
+        A leitura da última base e a inserção ocorrem na mesma transação de escrita,
+        para que dois processos não registrem a mesma transição duas vezes.
+        """
+        with closing(self._conectar()) as con, con:
+            con.execute("BEGIN IMMEDIATE")
+            linha = con.execute("SELECT snapshot FROM historico ORDER BY sequencia DESC LIMIT 1").fetchone()
+            ultimo = linha[0] if linha else None
+            if ultimo == snapshot:
+                return
+            con.execute("INSERT INTO historico (snapshot) VALUES (?)", (snapshot,))
+        if ultimo:
+            self.comparar_snapshots(ultimo, snapshot, tamanho_max)
+
+    def _chaves(self, con: sqlite3.Connection, snapshot: str, tamanho_max: int) -> Dict[str, int]:
+        return dict(con.execute(
+            """
+            SELECT k.chave, k.ciclo_id
+            FROM chaves_ciclos k
+            JOIN ciclos c ON c.snapshot = k.snapshot AND c.ciclo_id = k.ciclo_id
+            WHERE k.snapshot = ? AND c.tamanho <= ?
+            """,
+            (snapshot, tamanho_max),
+        ))
+
+    def _nomes_por_ciclo(self, con: sqlite3.Connection, snapshot: str, ciclo_ids: Set[int]) -> Dict[int, List[str]]:
+        nomes = {}
+        for ciclo_id, nome in con.execute(
+            """
+            SELECT m.ciclo_id, j.nome
+            FROM ciclo_membros m
+            JOIN juizes j ON j.snapshot = m.snapshot AND j.juiz_id = m.juiz_id
+            WHERE m.snapshot = ?
+            ORDER BY m.ciclo_id, m.posicao
+            """,
+            (snapshot,),
+        ):
+            if ciclo_id in ciclo_ids:
+                nomes.setdefault(ciclo_id, []).append(nome)
+        return nomes
+
+    def comparar_snapshots(self, anterior: str, atual: str, tamanho_max: int = 4) -> Dict[str, object]:
+        """
+        Diferença entre duas bases por operações de conjunto sobre as chaves canônicas:
+        ciclos novos, ciclos desfeitos e juízes afetados. O resultado é gravado como
+        feed por juiz na tabela de novidades.
+        """
+        with closing(self._conectar()) as con, con:
+            # Compara só até o tamanho calculado nas duas bases, para não acusar ciclos falsos
+            for (calculado,) in con.execute(
+                "SELECT tamanho_max FROM snapshots WHERE hash IN (?, ?)", (anterior, atual)
+            ):
+                tamanho_max = min(tamanho_max, calculado)
+            chaves_anteriores = self._chaves(con, anterior, tamanho_max)
+            chaves_atuais = self._chaves(con, atual, tamanho_max)
+            novos = chaves_atuais.keys() - chaves_anteriores.keys()
+            desfeitos = chaves_anteriores.keys() - chaves_atuais.keys()
+
+            nomes_novos = self._nomes_por_ciclo(con, atual, {chaves_atuais[k] for k in novos})
+            nomes_desfeitos = self._nomes_por_ciclo(con, anterior, {chaves_anteriores[k] for k in desfeitos})
+
+            linhas = [
+                (atual, anterior, nome, "novo", chave)
+                for chave in novos for nome in nomes_novos[chaves_atuais[chave]]
+            ] + [
+                (atual, anterior, nome, "desfeito", chave)
+                for chave in desfeitos for nome in nomes_desfeitos[chaves_anteriores[chave]]
+            ]
+            con.execute("DELETE FROM novidades WHERE snapshot = ? AND anterior = ?", (atual, anterior))
+            con.executemany("INSERT INTO novidades VALUES (?, ?, ?, ?, ?)", linhas)
+
+        return {
+            "anterior": anterior,
+            "atual": atual,
+            "novos": len(novos),
+            "desfeitos": len(desfeitos),
+            "afetados": sorted({linha[2] for linha in linhas}),
+        }
+
+    def novidades_do_juiz(self, nome: str, snapshot: Optional[str] = None) -> Dict[str, List[List[Dict[str, str]]]]:
+        """
+        Feed "o que há de novo para mim": ciclos que surgiram e que se desfizeram
+        na última atualização da base (ou na atualização que gerou snapshot)
+        """
+        snapshot = snapshot or self._ultimo_snapshot()
+        anterior = self.snapshot_anterior(snapshot) if snapshot else None
+        if anterior is None:
+            return {"novos": [], "desfeitos": []}
+
+        feed = {}
+        for tipo, origem in [("novo", snapshot), ("desfeito", anterior)]:
+            feed[tipo + "s"] = self._ler_ciclos(
+                origem,
+                """
+                SELECT k.ciclo_id
+                FROM novidades n
+                JOIN chaves_ciclos k ON k.chave = n.chave
+                WHERE n.snapshot = ? AND n.anterior = ? AND n.nome = ? AND n.tipo = ? AND k.snapshot = ?
+                """,
+                (snapshot, anterior, nome.strip(), tipo, origem),
+                None,
+            )
+        return feed
+
+    def _ultimo_snapshot(self) -> Optional[str]:
+        with closing(self._conectar()) as con:
+            linha = con.execute("SELECT snapshot FROM historico ORDER BY sequencia DESC LIMIT 1").fetchone()
+        return linha[0] if linha else None
+
+    def feed_completo(self, snapshot: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Resumo por juiz (novos/desfeitos) para um notificador em lote
+        """
+        snapshot = snapshot or self._ultimo_snapshot()
+        anterior = self.snapshot_anterior(snapshot) if snapshot else None
+        if anterior is None:
+            return {}
+        feed = {}
+        with closing(self._conectar()) as con:
+            for nome, tipo, total in con.execute(
+                """
+                SELECT nome, tipo, COUNT(*) FROM novidades
+                WHERE snapshot = ? AND anterior = ?
+                GROUP BY nome, tipo
+                """,
+                (snapshot, anterior),
+            ):
+                feed.setdefault(nome, {"novos": 0, "desfeitos": 0})[tipo + "s"] = total
+        return feed
@@ -0,0 +1,95 @@
+"""
+Teste de carga do servico.py: mede vazão e latência com vários clientes simultâneos.
+
+Sem --url, sobe o serviço no próprio processo com uma base sintética.
+
+Uso:
+    python benchmarks/carga_servico.py --juizes 400 --requisicoes 2000
+    python benchmarks/carga_servico.py --url http://127.0.0.1:8765 --arquivo base.csv
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+from urllib.request import urlopen
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algoritmo import Juiz
+from tribunais import coordenadas_tj
+
+
+def base_sintetica(quantidade, semente=42):
+    sorteio = random.Random(semente)
+    siglas = list(coordenadas_tj)
+    return [
+        Juiz(f"Juiz {i:04d}", sorteio.choice(siglas), sorteio.sample(siglas, 3), "Final")
+        for i in range(quantidade)
+    ]
+
+
+def medir(url, nomes, clientes, requisicoes):
+    caminhos = [f"/juiz?nome={quote(random.choice(nomes))}" for _ in range(requisicoes)]
+
+    def consultar(caminho):
+        inicio = time.perf_counter()
+        with urlopen(url + caminho) as resposta:
+            resposta.read()
+        return time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clientes) as pool:
+        latencias = sorted(pool.map(consultar, caminhos))
+    duracao = time.perf_counter() - inicio
+    return {
+        "clientes": clientes,
+        "req_s": requisicoes / duracao,
+        "p50_ms": statistics.median(latencias) * 1000,
+        "p95_ms": latencias[int(len(latencias) * 0.95) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga do serviço de permutas")
+    parser.add_argument("--url", help="Serviço já em execução (ex.: http://127.0.0.1:8765)")
+    parser.add_argument("--arquivo", nargs="+", help="Fontes usadas para sortear nomes quando --url é informado")
+    parser.add_argument("--juizes", type=int, default=400)
+    parser.add_argument("--requisicoes", type=int, default=2000)
+    parser.add_argument("--clientes", default="1,4,16,64")
+    args = parser.parse_args()
+
+    servidor = None
+    if args.url:
+        from algoritmo import criar_juizes
+        from carregamento import carregar_fontes
+        url = args.url.rstrip("/")
+        nomes = [j.nome for j in criar_juizes(carregar_fontes(args.arquivo))]
+    else:
+        from servico import MotorConsultas, ServidorConsultas
+        juizes = base_sintetica(args.juizes)
+        inicio = time.perf_counter()
+        motor = MotorConsultas(juizes, os.path.join(tempfile.mkdtemp(), "carga.sqlite3"))
+        print(f"Motor carregado em {time.perf_counter() - inicio:.2f}s")
+        servidor = ServidorConsultas(("127.0.0.1", 0), motor, trabalhadores=16)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{servidor.server_address[1]}"
+        nomes = [j.nome for j in juizes]
+
+    print(f"{'clientes':>8} {'req/s':>10} {'p50 (ms)':>10} {'p95 (ms)':>10}")
+    for clientes in (int(c) for c in args.clientes.split(",")):
+        r = medir(url, nomes, clientes, args.requisicoes)
+        print(f"{r['clientes']:>8} {r['req_s']:>10.1f} {r['p50_ms']:>10.2f} {r['p95_ms']:>10.2f}")
+
+    if servidor:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
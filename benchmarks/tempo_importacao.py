@@ -0,0 +1,100 @@
+"""
+Perfil de tempo de importação (ms por módulo) da partida a frio do app.py.
+
+Lê os imports de nível superior do app.py, importa-os num processo novo com
+`python -X importtime` e mostra quanto cada um custa. Também mede, à parte, os
+módulos que o app só importa sob demanda, para acompanhar o que foi adiado.
+
+Uso:
+    python benchmarks/tempo_importacao.py
+    python benchmarks/tempo_importacao.py --repeticoes 5 --json importacao.json
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# plotly.graph_objects não entra aqui: o próprio streamlit já o importa na partida
+SOB_DEMANDA = ["gspread", "plotly.express", "mapa", "graficos"]
+
+
+def imports_de_nivel_superior(caminho):
+    with open(caminho, encoding="utf-8") as arquivo:
+        arvore = ast.parse(arquivo.read())
+    modulos = []
+    for no in arvore.body:
+        if isinstance(no, ast.Import):
+            modulos.extend(alias.name for alias in no.names)
+        elif isinstance(no, ast.ImportFrom) and no.module:
+            modulos.append(no.module)
+    return list(dict.fromkeys(modulos))
+
+
+def medir(modulos):
+    """
+    Importa os módulos em ordem num interpretador novo e devolve o tempo
+    cumulativo (ms) de cada um, como reportado por -X importtime
+    """
+    codigo = "; ".join(f"import {m}" for m in modulos)
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ, capture_output=True, text=True,
+    )
+    if processo.returncode != 0:
+        raise RuntimeError(processo.stderr.strip().splitlines()[-1])
+    tempos = {}
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, cumulativo, nome = linha[len("import time:"):].split("|")
+        nome = nome.strip()
+        if nome in modulos:
+            tempos[nome] = int(cumulativo) / 1000
+    return {m: tempos.get(m, 0.0) for m in modulos}
+
+
+def mediana(execucoes):
+    return {m: statistics.median(e[m] for e in execucoes) for m in execucoes[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfil de importação da partida a frio do app.py")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--json", help="Grava o resultado neste arquivo para acompanhamento")
+    args = parser.parse_args()
+
+    partida = imports_de_nivel_superior(os.path.join(RAIZ, "app.py"))
+    tempos_partida = mediana([medir(partida) for _ in range(args.repeticoes)])
+
+    tempos_adiados = {}
+    for modulo in SOB_DEMANDA:
+        try:
+            tempos_adiados[modulo] = mediana([medir([modulo]) for _ in range(args.repeticoes)])[modulo]
+        except RuntimeError as e:
+            tempos_adiados[modulo] = None
+            print(f"⚠️ {modulo}: {e}")
+
+    print("Partida a frio (imports de nível superior do app.py)")
+    for modulo, ms in tempos_partida.items():
+        print(f"  {modulo:<28} {ms:>9.1f} ms")
+    print(f"  {'TOTAL':<28} {sum(tempos_partida.values()):>9.1f} ms")
+    print("\nAdiados (importados só quando necessários, medidos isoladamente)")
+    for modulo, ms in tempos_adiados.items():
+        print(f"  {modulo:<28} {'indisponível' if ms is None else f'{ms:>9.1f} ms':>12}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as arquivo:
+            json.dump({
+                "partida_ms": tempos_partida,
+                "partida_total_ms": sum(tempos_partida.values()),
+                "adiados_ms": tempos_adiados,
+            }, arquivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple
+
+
+MAX_BYTES_PADRAO = 64 * 2 ** 20
+
+
+class CacheFiguras:
+    """
+    Cache LRU de figuras Plotly já serializadas em JSON, com limite de tamanho em bytes.
+
+    A chave é (hash da base, tipo de figura, parâmetros da consulta). Por ser um objeto
+    de módulo, é compartilhado entre todas as sessões do mesmo processo Streamlit.
+    """
+
+    def __init__(self, max_bytes: int = MAX_BYTES_PADRAO):
+        self.max_bytes = max_bytes
+        self._figuras = OrderedDict()
+        self._bytes = 0
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.faltas = 0
+
+    @staticmethod
+    def _chave(snapshot: str, tipo: str, parametros: Dict) -> Tuple[str, str, str]:
+        return snapshot, tipo, json.dumps(parametros or {}, sort_keys=True, default=str)
+
+    def obter_json(self, snapshot: str, tipo: str, parametros: Dict, construir: Callable) -> str:
+        """
+        Devolve o JSON da figura, chamando construir() apenas em caso de falta
+        """
+        chave = self._chave(snapshot, tipo, parametros)
+        with self._trava:
+            if chave in self._figuras:
+                self._figuras.move_to_end(chave)
+                self.acertos += 1
+                return self._figuras[chave]
+
+        figura_json = construir().to_json()
+
+        with self._trava:
+            self.faltas += 1
+            if chave not in self._figuras:
+                self._figuras[chave] = figura_json
+                self._bytes += len(figura_json)
+            while self._bytes > self.max_bytes and len(self._figuras) > 1:
+                _, removida = self._figuras.popitem(last=False)
+                self._bytes -= len(removida)
+        return figura_json
+
+    def obter(self, snapshot: str, tipo: str, parametros: Dict, construir: Callable) -> Dict:
+        """
+        Devolve a figura como dicionário, pronto para st.plotly_chart
+        """
+        return json.loads(self.obter_json(snapshot, tipo, parametros, construir))
+
+    def limpar(self, snapshot: str = None):
+        with self._trava:
+            for chave in [c for c in self._figuras if snapshot is None or c[0] == snapshot]:
+                self._bytes -= len(self._figuras.pop(chave))
+
+    def __len__(self):
+        return len(self._figuras)
+
+
+cache_figuras = CacheFiguras()
+
+
+def precomputar_figuras_globais(snapshot: str, tribunais_stats: Dict, total_juizes: int,
+                                carregar_registros: Callable[[int], List[Dict]] = None,
+                                tamanhos_mapa: Tuple[int, ...] = (2, 3),
+                                calcular_componentes: Callable[[], Dict] = None,
+                                cache: CacheFiguras = cache_figuras) -> Dict[str, Dict]:
+    """
+    Monta uma única vez, por base, os gráficos que não dependem do juiz selecionado
+    (estatísticas de tribunais e, se informado carregar_registros, os mapas com todos
+    os ciclos; se informado calcular_componentes, o gráfico dos grupos de juízes
+    interligados). Ciclos e componentes só são calculados quando a figura falta no cache.
+    """
+    # graficos.py/mapa.py (e o Plotly Express) só são importados se alguma figura faltar no cache
+    def grafico(nome_funcao, *args):
+        def construir():
+            import graficos
+            return getattr(graficos, nome_funcao)(*args)
+        return construir
+
+    def mapa_de(nome_funcao, n, *extras):
+        def construir():
+            import mapa
+            return getattr(mapa, nome_funcao)(carregar_registros(n), *extras)
+        return construir
+
+    def componentes():
+        import graficos
+        analise = calcular_componentes()
+        return graficos.criar_grafico_componentes(
+            [[j.nome for j in s] for s in analise["subproblemas"]], analise["tribunais"]
+        )
+
+    construtores = {
+        "tribunais_procurados": grafico("criar_grafico_tribunais_procurados", tribunais_stats),
+        "tribunais_exportadores": grafico("criar_grafico_tribunais_exportadores", tribunais_stats),
+        "tribunais_conectados": grafico("criar_grafico_tribunais_conectados", tribunais_stats),
+        "estatisticas_gerais": grafico("criar_grafico_estatisticas_gerais", tribunais_stats, total_juizes),
+    }
+    for n in tamanhos_mapa if carregar_registros else ():
+        if n == 2:
+            construtores["mapa_casais"] = mapa_de("mostrar_mapa_casais", 2)
+        elif n == 3:
+            construtores["mapa_triangulacoes"] = mapa_de("mostrar_mapa_triangulacoes", 3)
+        else:
+            construtores[f"mapa_ciclos_{n}"] = mapa_de("mostrar_mapa_ciclos_n", n, n)
+    if calcular_componentes:
+        construtores["componentes"] = componentes
+    return {tipo: cache.obter(snapshot, tipo, {}, construir) for tipo, construir in construtores.items()}
@@ -0,0 +1,130 @@
+"""
+Carregamento de várias fontes (abas do Google Sheets, CSV, XLSX ou JSON local)
+em paralelo, unificadas numa única tabela normalizada para o algoritmo.
+
+Formato das fontes:
+    "planilha:Permuta - Magistratura Estadual"          primeira aba da planilha
+    "planilha:Permuta - Magistratura Estadual#2025-1"   aba pelo nome
+    "dados/inscricoes.csv"
+    "dados/inscricoes.xlsx#2025-2"                      aba do arquivo (padrão: primeira)
+    "dados/planilha_local.json"                         linhas como get_all_values()
+"""
+import hashlib
+import json
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+
+COLUNAS_OPCIONAIS = ["Destino 1", "Destino 2", "Destino 3", "E-mail", "Entrância"]
+
+
+def normalizar_texto(texto):
+    if not isinstance(texto, str):
+        return ""
+    texto_norm = unicodedata.normalize('NFKD', texto)
+    texto_sem_acento = ''.join(c for c in texto_norm if not unicodedata.combining(c))
+    return " ".join(texto_sem_acento.split()).lower()
+
+
+def normalizar_tabela(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Padroniza uma aba da planilha: espaços, células vazias como None e nome normalizado
+    """
+    df = df.copy()
+    if "Entrância" not in df.columns:
+        df["Entrância"] = "Não informada"
+    for coluna in COLUNAS_OPCIONAIS:
+        if coluna in df.columns:
+            df[coluna] = df[coluna].apply(lambda x: str(x).strip() if pd.notnull(x) and str(x).strip() != "" else None)
+    df["Nome"] = df["Nome"].astype(str).str.strip()
+    df["Origem"] = df["Origem"].astype(str).str.strip()
+    df["Nome_Normalizado"] = df["Nome"].apply(normalizar_texto)
+    return df
+
+
+def _linhas_para_tabela(linhas: List[List[str]]) -> pd.DataFrame:
+    if not linhas:
+        return pd.DataFrame(columns=["Nome", "Origem"])
+    return pd.DataFrame(linhas[1:], columns=linhas[0])
+
+
+def _ler_fonte(fonte: str, cliente_sheets=None) -> pd.DataFrame:
+    caminho, _, aba = fonte.partition("#")
+    if caminho.startswith("planilha:"):
+        if cliente_sheets is None:
+            raise ValueError(f"Fonte do Google Sheets sem credenciais: {fonte}")
+        planilha = cliente_sheets.open(caminho[len("planilha:"):])
+        worksheet = planilha.worksheet(aba) if aba else planilha.sheet1
+        return _linhas_para_tabela(worksheet.get_all_values())
+    extensao = caminho.lower().rsplit(".", 1)[-1]
+    if extensao == "csv":
+        return pd.read_csv(caminho, dtype=str, keep_default_na=False)
+    if extensao in ("xlsx", "xls"):
+        return pd.read_excel(caminho, sheet_name=aba or 0, dtype=str, keep_default_na=False)
+    if extensao == "json":
+        with open(caminho, encoding="utf-8") as arquivo:
+            return _linhas_para_tabela(json.load(arquivo))
+    raise ValueError(f"Tipo de fonte não suportado: {fonte}")
+
+
+def chave_juiz(nome: str, email: Optional[str]) -> str:
+    """
+    Chave de deduplicação: e-mail normalizado quando existe, senão o nome normalizado
+    """
+    if isinstance(email, str) and email.strip():
+        base = f"email:{normalizar_texto(email)}"
+    else:
+        base = f"nome:{normalizar_texto(nome)}"
+    return hashlib.sha1(base.encode("utf-8")).hexdigest()
+
+
+def deduplicar(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Remove inscrições repetidas do mesmo juiz: mesmo e-mail ou, para linhas sem e-mail,
+    mesmo nome normalizado. Prevalece a linha da fonte listada por último, isto é,
+    a inscrição mais recente.
+    """
+    vistos = set()
+    manter = []
+    emails = df["E-mail"] if "E-mail" in df.columns else pd.Series([None] * len(df), index=df.index)
+    for indice, nome, email in zip(reversed(df.index), reversed(df["Nome"].tolist()), reversed(emails.tolist())):
+        chave = chave_juiz(nome, email)
+        if chave in vistos:
+            continue
+        vistos.add(chave)
+        manter.append(indice)
+    return df.loc[sorted(manter)]
+
+
+def carregar_fontes(fontes: List[str], credenciais: Optional[Dict] = None,
+                    max_trabalhadores: int = 8) -> pd.DataFrame:
+    """
+    Lê todas as fontes em paralelo (o tempo total fica próximo ao da fonte mais lenta),
+    normaliza, concatena na ordem informada e remove juízes duplicados.
+
+    O tempo de cada fonte fica em df.attrs["tempos_fontes"].
+    """
+    cliente_sheets = None
+    if credenciais is not None and any(f.startswith("planilha:") for f in fontes):
+        import gspread
+
+        cliente_sheets = gspread.service_account_from_dict(credenciais)
+
+    def ler(fonte):
+        inicio = time.perf_counter()
+        df = normalizar_tabela(_ler_fonte(fonte, cliente_sheets))
+        df["Fonte"] = fonte
+        return df, time.perf_counter() - inicio
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_trabalhadores, len(fontes)))) as pool:
+        resultados = list(pool.map(ler, fontes))
+
+    tabelas = [df for df, _ in resultados]
+    df = deduplicar(pd.concat(tabelas, ignore_index=True)) if tabelas else pd.DataFrame()
+    df = df.reset_index(drop=True)
+    df.attrs["tempos_fontes"] = {fonte: segundos for fonte, (_, segundos) in zip(fontes, resultados)}
+    return df
@@ -56,7 +56,7 @@ def criar_grafico_tribunais_procurados(tribunais_stats):
         margin=dict(l=50, r=50, t=80, b=50)
     )
     
-    fig.update_xaxis(tickangle=-45)
+    fig.update_xaxes(tickangle=-45)
     
     return fig
 
@@ -113,7 +113,7 @@ def criar_grafico_tribunais_exportadores(tribunais_stats):
         margin=dict(l=50, r=50, t=80, b=50)
     )
     
-    fig.update_xaxis(tickangle=-45)
+    fig.update_xaxes(tickangle=-45)
     
     return fig
 
@@ -187,7 +187,7 @@ def criar_grafico_tribunais_conectados(tribunais_stats):
         )
     )
     
-    fig.update_xaxis(tickangle=-45)
+    fig.update_xaxes(tickangle=-45)
     
     return fig
 
@@ -243,4 +243,50 @@ def criar_grafico_estatisticas_gerais(tribunais_stats, total_juizes):
         margin=dict(l=50, r=50, t=80, b=50)
     )
     
-    return fig
\ No newline at end of file
+    return fig
+
+def criar_grafico_componentes(componentes_juizes, componentes_tribunais):
+    """
+    Cria gráfico de barras com o tamanho de cada componente fortemente conexo
+    (grupos de juízes que podem formar ciclos entre si)
+    """
+    if not componentes_juizes:
+        fig = go.Figure()
+        fig.add_annotation(
+            text="Nenhum dado disponível",
+            xref="paper", yref="paper",
+            x=0.5, y=0.5, showarrow=False
+        )
+        return fig
+    
+    rotulos = [f"Grupo {i+1}" for i in range(len(componentes_juizes))]
+    tamanhos = [len(c) for c in componentes_juizes]
+    
+    fig = go.Figure(data=[
+        go.Bar(
+            x=rotulos,
+            y=tamanhos,
+            text=tamanhos,
+            textposition='auto',
+            marker_color='rgba(102, 126, 234, 0.8)',
+            hovertemplate='<b>%{x}</b><br>Juízes: %{y}<extra></extra>'
+        )
+    ])
+    
+    fig.update_layout(
+        title={
+            'text': f'🕸️ Grupos de Juízes Interligados ({len(componentes_tribunais)} blocos de tribunais)',
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {'size': 20, 'family': 'Inter', 'color': '#2c3e50'}
+        },
+        xaxis_title='Componentes',
+        yaxis_title='Número de Juízes',
+        plot_bgcolor='rgba(255, 255, 255, 0.8)',
+        paper_bgcolor='rgba(255, 255, 255, 0.5)',
+        font=dict(family="Inter", size=12, color="#2c3e50"),
+        height=400,
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+    
+    return fig
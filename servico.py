@@ -0,0 +1,172 @@
+"""
+Serviço HTTP local (somente biblioteca padrão) que responde consultas de permutas em JSON.
+
+A base e o índice de ciclos são carregados uma única vez; as requisições são atendidas
+por um pool de threads, com cache de respostas por requisição.
+
+Uso:
+    python servico.py --arquivo base.csv outra_base.xlsx#2025-1 --porta 8765 --trabalhadores 8
+
+Rotas:
+    GET /saude
+    GET /juiz?nome=<nome>&tamanho_max=<n>
+    GET /cobertura
+    GET /tribunais
+    GET /tribunal?sigla=<sigla>
+"""
+import argparse
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+from algoritmo import Juiz, criar_juizes, analisar_cobertura, calcular_estatisticas_tribunais
+from armazenamento import RepositorioCiclos
+from carregamento import carregar_fontes
+
+
+# Banco próprio: o histórico de bases do app (planilha ao vivo) não deve se misturar
+# com o das exportações em arquivo servidas aqui
+CAMINHO_BANCO_SERVICO = "ciclos_servico.sqlite3"
+
+
+class MotorConsultas:
+    """
+    Mantém a base, o hash da base e o índice de ciclos por juiz e por tribunal em memória
+    """
+
+    def __init__(self, juizes: List[Juiz], caminho_banco: str = CAMINHO_BANCO_SERVICO,
+                 tamanho_max: int = 4, tamanho_cache: int = 4096):
+        self.juizes = juizes
+        self.nomes = {j.nome for j in juizes}
+        repositorio = RepositorioCiclos(caminho_banco)
+        self.snapshot = repositorio.obter_ou_calcular(juizes, tamanho_max)
+        ciclos = repositorio.ciclos_da_base(self.snapshot, tamanho_max)
+
+        self.por_juiz = {}
+        self.por_tribunal = {}
+        for ciclo in ciclos:
+            for membro in ciclo:
+                self.por_juiz.setdefault(membro["nome"], []).append(ciclo)
+                self.por_tribunal.setdefault(membro["origem"], []).append(ciclo)
+        for indice in (self.por_juiz, self.por_tribunal):
+            for chave, lista in indice.items():
+                indice[chave] = list({id(c): c for c in lista}.values())
+
+        por_nome = {j.nome: j for j in juizes}
+        tuplas = [tuple(por_nome[m["nome"]] for m in c) for c in ciclos]
+        cobertura = analisar_cobertura(
+            juizes,
+            [c for c in tuplas if len(c) == 2],
+            [c for c in tuplas if len(c) == 3],
+            [c for c in tuplas if len(c) >= 4],  # quadrangulações e ciclos maiores
+        )
+        self.cobertura = {
+            "total_juizes": len(cobertura["todos"]),
+            "total_envolvidos": len(cobertura["envolvidos"]),
+            "nao_envolvidos": sorted(cobertura["nao_envolvidos"]),
+            "impossiveis": sorted(cobertura["impossiveis"]),
+            "componentes_tribunais": cobertura["componentes_tribunais"],
+        }
+        self.tribunais = calcular_estatisticas_tribunais(juizes)
+        self.responder = lru_cache(maxsize=tamanho_cache)(self._responder)
+
+    def _responder(self, rota: str, consulta: str) -> Tuple[int, bytes]:
+        parametros = {k: v[0] for k, v in parse_qs(consulta).items()}
+        if rota == "/saude":
+            corpo = {"snapshot": self.snapshot, "juizes": len(self.juizes)}
+        elif rota == "/juiz":
+            nome = parametros.get("nome", "").strip()
+            if nome not in self.nomes:
+                return 404, self._json({"erro": f"Juiz não encontrado: {nome}"})
+            tamanho_max = int(parametros.get("tamanho_max", 99))
+            ciclos = [c for c in self.por_juiz.get(nome, []) if len(c) <= tamanho_max]
+            corpo = {"snapshot": self.snapshot, "nome": nome, "total": len(ciclos), "ciclos": ciclos}
+        elif rota == "/tribunal":
+            sigla = parametros.get("sigla", "").strip()
+            ciclos = self.por_tribunal.get(sigla, [])
+            corpo = {"snapshot": self.snapshot, "sigla": sigla, "total": len(ciclos), "ciclos": ciclos}
+        elif rota == "/cobertura":
+            corpo = {"snapshot": self.snapshot, **self.cobertura}
+        elif rota == "/tribunais":
+            corpo = {"snapshot": self.snapshot, "tribunais": self.tribunais}
+        else:
+            return 404, self._json({"erro": f"Rota desconhecida: {rota}"})
+        return 200, self._json(corpo)
+
+    @staticmethod
+    def _json(corpo: Dict) -> bytes:
+        return json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+
+
+class ManipuladorConsultas(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            status, corpo = self.server.motor.responder(url.path, url.query)
+        except ValueError as e:
+            status, corpo = 400, MotorConsultas._json({"erro": str(e)})
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+class ServidorConsultas(HTTPServer):
+    """
+    HTTPServer que despacha cada conexão para um pool fixo de threads
+    """
+
+    request_queue_size = 128
+
+    def __init__(self, endereco, motor: MotorConsultas, trabalhadores: int = 8):
+        super().__init__(endereco, ManipuladorConsultas)
+        self.motor = motor
+        self.pool = ThreadPoolExecutor(max_workers=trabalhadores)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._atender, request, client_address)
+
+    def _atender(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço JSON de consultas de permutas")
+    parser.add_argument("--arquivo", required=True, nargs="+",
+                        help="Uma ou mais fontes (CSV, XLSX[#aba] ou JSON), lidas em paralelo")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--trabalhadores", type=int, default=8)
+    parser.add_argument("--tamanho-max", type=int, default=4)
+    parser.add_argument("--banco", default=CAMINHO_BANCO_SERVICO)
+    args = parser.parse_args()
+
+    motor = MotorConsultas(criar_juizes(carregar_fontes(args.arquivo)), args.banco, args.tamanho_max)
+    servidor = ServidorConsultas((args.host, args.porta), motor, args.trabalhadores)
+    print(f"🚀 Servindo {len(motor.juizes)} juízes em http://{args.host}:{args.porta} (snapshot {motor.snapshot[:12]})")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
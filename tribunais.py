@@ -0,0 +1,88 @@
+from typing import List
+
+import numpy as np
+
+# Dicionário de coordenadas (latitude, longitude) para todos os TJs do Brasil
+coordenadas_tj = {
+    "TJAC": [-9.97499, -67.8243],
+    "TJAL": [-9.66599, -35.7350],
+    "TJAM": [-3.10719, -60.0261],
+    "TJAP": [0.034934, -51.0694],
+    "TJBA": [-12.9714, -38.5014],
+    "TJCE": [-3.71722, -38.5433],
+    "TJDFT": [-15.77972, -47.92972],
+    "TJES": [-20.3155, -40.3128],
+    "TJGO": [-16.6864, -49.2643],
+    "TJMA": [-2.52972, -44.3028],
+    "TJMG": [-19.9167, -43.9345],
+    "TJMS": [-20.4428, -54.6464],
+    "TJMT": [-15.5989, -56.0949],
+    "TJPA": [-1.45583, -48.5039],
+    "TJPB": [-7.1150, -34.8641],
+    "TJPE": [-8.04756, -34.8770],
+    "TJPI": [-5.08917, -42.8019],
+    "TJPR": [-25.4284, -49.2733],
+    "TJRJ": [-22.9035, -43.2096],
+    "TJRN": [-5.79448, -35.2110],
+    "TJRO": [-8.76194, -63.9039],
+    "TJRR": [2.81972, -60.6733],
+    "TJRS": [-30.0346, -51.2177],
+    "TJSC": [-27.5969, -48.5495],
+    "TJSE": [-10.9111, -37.0717],
+    "TJSP": [-23.5505, -46.6333],
+    "TJTO": [-10.1841, -48.3336]
+}
+
+# ==========================
+# 📏 DISTÂNCIAS ENTRE TRIBUNAIS
+# ==========================
+
+RAIO_TERRA_KM = 6371.0088
+
+# IDs internos: posição da sigla na matriz; a última posição representa tribunal desconhecido
+SIGLAS = list(coordenadas_tj)
+ID_TRIBUNAL = {sigla: i for i, sigla in enumerate(SIGLAS)}
+ID_DESCONHECIDO = len(SIGLAS)
+
+
+def _matriz_distancias() -> np.ndarray:
+    """
+    Distância de grande círculo (haversine), em km, entre todos os pares de tribunais,
+    calculada de uma vez com NumPy. Pares com tribunal desconhecido ficam como infinito.
+    """
+    lat, lon = np.radians(np.array([coordenadas_tj[s] for s in SIGLAS], dtype=float)).T
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    matriz = np.full((len(SIGLAS) + 1, len(SIGLAS) + 1), np.inf)
+    matriz[:-1, :-1] = 2 * RAIO_TERRA_KM * np.arcsin(np.sqrt(a))
+    return matriz
+
+
+DISTANCIAS_KM = _matriz_distancias()
+
+
+def ids_tribunais(siglas: List[str]) -> np.ndarray:
+    return np.array([ID_TRIBUNAL.get(s, ID_DESCONHECIDO) for s in siglas], dtype=np.intp)
+
+
+def pontuar_ciclos(origens_por_ciclo: List[List[str]], criterio: str = "total") -> np.ndarray:
+    """
+    Distância de cada ciclo, dado pela lista de origens na ordem do ciclo
+    (cada juiz vai da sua origem para a origem do próximo).
+
+    criterio="total" soma os trechos; criterio="maximo" usa o maior trecho.
+    """
+    if criterio not in ("total", "maximo"):
+        raise ValueError(f"Critério de distância inválido: {criterio}")
+    pontuacao = np.zeros(len(origens_por_ciclo))
+    por_tamanho = {}
+    for posicao, origens in enumerate(origens_por_ciclo):
+        por_tamanho.setdefault(len(origens), []).append(posicao)
+    for tamanho, posicoes in por_tamanho.items():
+        if tamanho == 0:
+            continue
+        ids = ids_tribunais([s for p in posicoes for s in origens_por_ciclo[p]]).reshape(len(posicoes), tamanho)
+        trechos = DISTANCIAS_KM[ids, np.roll(ids, -1, axis=1)]
+        pontuacao[posicoes] = trechos.sum(axis=1) if criterio == "total" else trechos.max(axis=1)
+    return pontuacao